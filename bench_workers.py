@@ -0,0 +1,96 @@
+"""Measure startup time and per-worker memory at 1, 4 and 16 workers (Linux only)
+
+Compares the preloaded gunicorn mode (gunicorn.conf.py) with plain
+``uvicorn --workers N``, where every worker imports and builds everything itself.
+Each run starts from an empty SQLite database so seeding is included.
+
+    python bench_workers.py [--workers 1 4 16] [--port 8200]
+"""
+import argparse
+import os
+import re
+import select
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+STARTED = re.compile(r"Started server process \[(\d+)\]")
+READY = "Application startup complete."
+
+def server_command(mode: str, workers: int, port: int) -> List[str]:
+    if mode == "gunicorn":
+        return [sys.executable, "-m", "gunicorn", "main:app",
+                "--workers", str(workers), "--bind", f"127.0.0.1:{port}"]
+    return [sys.executable, "-m", "uvicorn", "main:app",
+            "--workers", str(workers), "--port", str(port)]
+
+def memory_kb(pid: int) -> Dict[str, int]:
+    """Rss, Pss and private (unshared) memory of a process from smaps_rollup"""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(':')] = int(parts[1])
+    return {
+        'rss': fields.get('Rss', 0),
+        'pss': fields.get('Pss', 0),
+        'private': fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0),
+    }
+
+def run(mode: str, workers: int, port: int, timeout: float = 120) -> Dict:
+    """Start the server, wait until every worker is ready and sample its memory"""
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp}/bench.db")
+        start = time.perf_counter()
+        proc = subprocess.Popen(server_command(mode, workers, port), env=env,
+                                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        pids, ready = [], 0
+        try:
+            deadline = start + timeout
+            while ready < workers:
+                if time.perf_counter() > deadline or proc.poll() is not None:
+                    raise RuntimeError(f"{mode} with {workers} workers did not start")
+                if not select.select([proc.stdout], [], [], 0.5)[0]:
+                    continue
+                line = proc.stdout.readline()
+                match = STARTED.search(line)
+                if match:
+                    pids.append(int(match.group(1)))
+                elif READY in line:
+                    ready += 1
+            startup = time.perf_counter() - start
+
+            samples = [memory_kb(pid) for pid in pids]
+            return {
+                'mode': mode,
+                'workers': workers,
+                'startup_s': startup,
+                'rss_kb': sum(s['rss'] for s in samples) / len(samples),
+                'pss_kb': sum(s['pss'] for s in samples) / len(samples),
+                'private_kb': sum(s['private'] for s in samples) / len(samples),
+                'master_rss_kb': memory_kb(proc.pid)['rss'],
+            }
+        finally:
+            proc.terminate()
+            proc.communicate(timeout=30)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--modes", nargs="+", default=["gunicorn", "uvicorn"], choices=["gunicorn", "uvicorn"])
+    parser.add_argument("--port", type=int, default=8200)
+    args = parser.parse_args()
+
+    print(f"{'mode':<10}{'workers':>8}{'startup s':>11}{'RSS/worker MB':>15}"
+          f"{'PSS/worker MB':>15}{'private MB':>12}{'master MB':>11}")
+    for mode in args.modes:
+        for workers in args.workers:
+            r = run(mode, workers, args.port)
+            print(f"{r['mode']:<10}{r['workers']:>8}{r['startup_s']:>11.2f}{r['rss_kb'] / 1024:>15.1f}"
+                  f"{r['pss_kb'] / 1024:>15.1f}{r['private_kb'] / 1024:>12.1f}{r['master_rss_kb'] / 1024:>11.1f}")
+
+if __name__ == "__main__":
+    main()
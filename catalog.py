@@ -0,0 +1,50 @@
+import os
+import json
+import hashlib
+from typing import Dict, List
+
+from rag_pipeline import ATTACHMENT_DIR, PROVIDER_FILES
+
+DATA_FILE = "data.json"
+
+def source_files() -> List[str]:
+    """Files the catalog and the RAG index are built from"""
+    return [DATA_FILE] + [os.path.join(ATTACHMENT_DIR, filename) for filename in PROVIDER_FILES]
+
+def compute_version() -> str:
+    """Hash the catalog source files into a short version stamp"""
+    digest = hashlib.sha256()
+    for filepath in source_files():
+        digest.update(filepath.encode('utf-8'))
+        if os.path.exists(filepath):
+            with open(filepath, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+class CatalogSnapshot:
+    """Read-only snapshot of data.json, built once per (master) process"""
+    def __init__(self):
+        self.data: Dict = {}
+        self.version = ""
+        self.load()
+
+    def load(self):
+        """Read data.json and stamp the snapshot with the current source version"""
+        self.version = compute_version()
+        with open(DATA_FILE, 'r') as f:
+            self.data = json.load(f)
+
+    @property
+    def districts(self) -> List[Dict]:
+        return self.data['districts']
+
+    @property
+    def bus_providers(self) -> List[Dict]:
+        return self.data['bus_providers']
+
+    def is_current(self) -> bool:
+        """Check the snapshot still matches the files on disk"""
+        return compute_version() == self.version
+
+# Global instance
+catalog = CatalogSnapshot()
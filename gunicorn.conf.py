@@ -0,0 +1,25 @@
+"""Gunicorn settings for multi-worker serving: gunicorn main:app
+
+The app is preloaded in the master, so data.json, the provider documents and the
+RAG index are read once and shared copy-on-write with every forked worker.
+"""
+import gc
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+def when_ready(server):
+    """Seed the database in the master before any worker is forked"""
+    from main import init_catalog
+    from database import engine
+
+    init_catalog()
+    # Forked workers must not share the master's pooled connections
+    engine.dispose()
+    # Move everything loaded so far out of the GC's reach so collections in the
+    # workers don't write to (and un-share) the preloaded pages
+    gc.collect()
+    gc.freeze()
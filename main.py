@@ -3,20 +3,28 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError, OperationalError
 from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
-import json
+import logging
 import os
 import random
 import string
 
 from database import engine, get_db, Base
-from models import District, BusProvider, Booking, Route
+from models import District, BusProvider, Booking, Route, CatalogVersion
 from rag_pipeline import rag_pipeline
+from catalog import catalog
+
+logger = logging.getLogger(__name__)
 
 # Create database tables
-Base.metadata.create_all(bind=engine)
+try:
+    Base.metadata.create_all(bind=engine)
+except OperationalError:
+    # Another worker created a table between the existence check and CREATE TABLE
+    Base.metadata.create_all(bind=engine)
 
 app = FastAPI(title="Bus Ticket Booking System")
 
@@ -63,130 +71,156 @@ def generate_booking_reference():
     """Generate unique booking reference"""
     return 'BK' + ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize database with data from data.json"""
-    db = next(get_db())
+def seed_database(db: Session):
+    """Load districts, providers and routes from the catalog snapshot"""
+    # Load districts
+    district_map = {}
+    for district_data in catalog.districts:
+        district = District(
+            name=district_data['name'],
+            dropping_points=district_data['dropping_points'],
+            description=f"Travel destination in Bangladesh",
+            is_active=True
+        )
+        db.add(district)
+        db.flush()
+        district_map[district.name] = district
     
-    # Check if data already exists
-    if db.query(District).count() == 0:
-        with open('data.json', 'r') as f:
-            data = json.load(f)
-        
-        # Load districts
-        district_map = {}
-        for district_data in data['districts']:
-            district = District(
-                name=district_data['name'],
-                dropping_points=district_data['dropping_points'],
-                description=f"Travel destination in Bangladesh",
-                is_active=True
-            )
-            db.add(district)
-            db.flush()
-            district_map[district.name] = district
+    # Load bus providers with their privacy policy info
+    provider_map = {}
+    for provider_data in catalog.bus_providers:
+        provider_info = rag_pipeline.get_provider_info(provider_data['name'])
+        privacy_text = ""
+        official_address = ""
+        contact = ""
+        email = ""
+        website = ""
         
-        # Load bus providers with their privacy policy info
-        provider_map = {}
-        for provider_data in data['bus_providers']:
-            provider_info = rag_pipeline.get_provider_info(provider_data['name'])
-            privacy_text = ""
-            official_address = ""
-            contact = ""
-            email = ""
-            website = ""
-            
-            if provider_info:
-                privacy_text = provider_info['content']
-                # Extract contact info from content
-                lines = provider_info['content'].split('\n')
-                for line in lines:
-                    if 'Official Address:' in line:
-                        official_address = line.split(':', 1)[-1].strip()
-                    elif 'Contact Information:' in line or 'Tel:' in line or 'Call Center' in line:
-                        contact = line.split(':', 1)[-1].strip()
-                    elif 'email' in line.lower() and '@' in line:
-                        parts = line.split()
-                        for part in parts:
-                            if '@' in part:
-                                email = part.strip()
-                    elif 'Privacy Policy / Terms Link:' in line or 'http' in line:
-                        parts = line.split()
-                        for part in parts:
-                            if 'http' in part:
-                                website = part.strip()
-            
-            provider = BusProvider(
-                name=provider_data['name'],
-                coverage_districts=provider_data['coverage_districts'],
-                official_address=official_address,
-                contact_info=contact,
-                email=email,
-                website=website,
-                privacy_policy=privacy_text,
-                rating=4.0 + (hash(provider_data['name']) % 10) / 10,  # Generate ratings 4.0-4.9
-                total_buses=10 + (hash(provider_data['name']) % 20),  # 10-30 buses
-                is_active=True
-            )
-            db.add(provider)
-            db.flush()
-            provider_map[provider.name] = provider
+        if provider_info:
+            privacy_text = provider_info['content']
+            # Extract contact info from content
+            lines = provider_info['content'].split('\n')
+            for line in lines:
+                if 'Official Address:' in line:
+                    official_address = line.split(':', 1)[-1].strip()
+                elif 'Contact Information:' in line or 'Tel:' in line or 'Call Center' in line:
+                    contact = line.split(':', 1)[-1].strip()
+                elif 'email' in line.lower() and '@' in line:
+                    parts = line.split()
+                    for part in parts:
+                        if '@' in part:
+                            email = part.strip()
+                elif 'Privacy Policy / Terms Link:' in line or 'http' in line:
+                    parts = line.split()
+                    for part in parts:
+                        if 'http' in part:
+                            website = part.strip()
         
-        # Create routes between districts for each provider
-        base_fares = {
-            ('Dhaka', 'Chattogram'): 600, ('Dhaka', 'Sylhet'): 700, ('Dhaka', 'Rajshahi'): 480,
-            ('Dhaka', 'Khulna'): 500, ('Dhaka', 'Barishal'): 450, ('Dhaka', 'Rangpur'): 550,
-            ('Dhaka', 'Mymensingh'): 300, ('Dhaka', 'Comilla'): 350, ('Dhaka', 'Bogra'): 420,
-            ('Chattogram', 'Sylhet'): 400, ('Chattogram', 'Cox\'s Bazar'): 350,
-            ('Khulna', 'Rajshahi'): 300, ('Khulna', 'Jessore'): 150,
-        }
-        
-        for provider in provider_map.values():
-            covered = provider.coverage_districts
-            for i, from_district in enumerate(covered):
-                for to_district in covered[i+1:]:
-                    # Get or estimate fare
-                    fare_key = (from_district, to_district)
-                    reverse_key = (to_district, from_district)
-                    base_fare = base_fares.get(fare_key, base_fares.get(reverse_key, 400))
-                    
-                    # Add some variation per provider
-                    fare = base_fare + (hash(provider.name + from_district) % 100)
+        provider = BusProvider(
+            name=provider_data['name'],
+            coverage_districts=provider_data['coverage_districts'],
+            official_address=official_address,
+            contact_info=contact,
+            email=email,
+            website=website,
+            privacy_policy=privacy_text,
+            rating=4.0 + (hash(provider_data['name']) % 10) / 10,  # Generate ratings 4.0-4.9
+            total_buses=10 + (hash(provider_data['name']) % 20),  # 10-30 buses
+            is_active=True
+        )
+        db.add(provider)
+        db.flush()
+        provider_map[provider.name] = provider
+    
+    # Create routes between districts for each provider
+    base_fares = {
+        ('Dhaka', 'Chattogram'): 600, ('Dhaka', 'Sylhet'): 700, ('Dhaka', 'Rajshahi'): 480,
+        ('Dhaka', 'Khulna'): 500, ('Dhaka', 'Barishal'): 450, ('Dhaka', 'Rangpur'): 550,
+        ('Dhaka', 'Mymensingh'): 300, ('Dhaka', 'Comilla'): 350, ('Dhaka', 'Bogra'): 420,
+        ('Chattogram', 'Sylhet'): 400, ('Chattogram', 'Cox\'s Bazar'): 350,
+        ('Khulna', 'Rajshahi'): 300, ('Khulna', 'Jessore'): 150,
+    }
+    
+    for provider in provider_map.values():
+        covered = provider.coverage_districts
+        for i, from_district in enumerate(covered):
+            for to_district in covered[i+1:]:
+                # Get or estimate fare
+                fare_key = (from_district, to_district)
+                reverse_key = (to_district, from_district)
+                base_fare = base_fares.get(fare_key, base_fares.get(reverse_key, 400))
+                
+                # Add some variation per provider
+                fare = base_fare + (hash(provider.name + from_district) % 100)
+                
+                if from_district in district_map and to_district in district_map:
+                    # Create route in both directions
+                    route1 = Route(
+                        provider_id=provider.id,
+                        from_district_id=district_map[from_district].id,
+                        to_district_id=district_map[to_district].id,
+                        base_fare=fare,
+                        distance_km=200 + (hash(from_district + to_district) % 300),
+                        duration_hours=3 + (hash(from_district + to_district) % 6),
+                        seat_class="AC" if hash(provider.name) % 2 == 0 else "Non-AC",
+                        available_seats=35 + (hash(from_district) % 10),
+                        total_seats=40,
+                        departure_times=["08:00", "14:00", "20:00", "23:00"],
+                        is_active=True
+                    )
+                    db.add(route1)
                     
-                    if from_district in district_map and to_district in district_map:
-                        # Create route in both directions
-                        route1 = Route(
-                            provider_id=provider.id,
-                            from_district_id=district_map[from_district].id,
-                            to_district_id=district_map[to_district].id,
-                            base_fare=fare,
-                            distance_km=200 + (hash(from_district + to_district) % 300),
-                            duration_hours=3 + (hash(from_district + to_district) % 6),
-                            seat_class="AC" if hash(provider.name) % 2 == 0 else "Non-AC",
-                            available_seats=35 + (hash(from_district) % 10),
-                            total_seats=40,
-                            departure_times=["08:00", "14:00", "20:00", "23:00"],
-                            is_active=True
-                        )
-                        db.add(route1)
-                        
-                        route2 = Route(
-                            provider_id=provider.id,
-                            from_district_id=district_map[to_district].id,
-                            to_district_id=district_map[from_district].id,
-                            base_fare=fare,
-                            distance_km=200 + (hash(from_district + to_district) % 300),
-                            duration_hours=3 + (hash(from_district + to_district) % 6),
-                            seat_class="AC" if hash(provider.name) % 2 == 0 else "Non-AC",
-                            available_seats=35 + (hash(to_district) % 10),
-                            total_seats=40,
-                            departure_times=["07:00", "13:00", "19:00", "22:00"],
-                            is_active=True
-                        )
-                        db.add(route2)
+                    route2 = Route(
+                        provider_id=provider.id,
+                        from_district_id=district_map[to_district].id,
+                        to_district_id=district_map[from_district].id,
+                        base_fare=fare,
+                        distance_km=200 + (hash(from_district + to_district) % 300),
+                        duration_hours=3 + (hash(from_district + to_district) % 6),
+                        seat_class="AC" if hash(provider.name) % 2 == 0 else "Non-AC",
+                        available_seats=35 + (hash(to_district) % 10),
+                        total_seats=40,
+                        departure_times=["07:00", "13:00", "19:00", "22:00"],
+                        is_active=True
+                    )
+                    db.add(route2)
+
+
+def init_catalog():
+    """Seed the database once per catalog version
+    
+    Safe to call from the gunicorn master and from every worker: a worker that
+    finds the version stamp already present only verifies it instead of rebuilding.
+    """
+    if not catalog.is_current():
+        logger.warning("data.json or attachments changed since the catalog snapshot was built; restart to reload")
+    
+    db = next(get_db())
+    try:
+        stamp = db.query(CatalogVersion).first()
+        if stamp is not None:
+            if stamp.version != catalog.version:
+                logger.warning("Database was seeded from catalog version %s, current is %s", stamp.version, catalog.version)
+            return
         
+        # Claim the stamp first so concurrently starting workers seed only once
+        db.add(CatalogVersion(id=1, version=catalog.version))
+        db.flush()
+        
+        # Databases seeded before version stamps existed only need the stamp
+        if db.query(District).count() == 0:
+            seed_database(db)
         db.commit()
-    db.close()
+    except IntegrityError:
+        # Another worker committed the stamp first
+        db.rollback()
+    finally:
+        db.close()
+
+@app.on_event("startup")
+async def startup_event():
+    """Initialize database with data from data.json"""
+    init_catalog()
 
 @app.get("/")
 async def root():
@@ -105,3 +105,11 @@ class Booking(Base):
     # Relationships
     route = relationship("Route", back_populates="bookings")
     provider = relationship("BusProvider", back_populates="bookings")
+
+class CatalogVersion(Base):
+    __tablename__ = "catalog_version"
+    
+    # Single row (id=1) stamping which data.json / attachment version seeded the database
+    id = Column(Integer, primary_key=True)
+    version = Column(String(64), nullable=False)
+    seeded_at = Column(DateTime, default=func.now())
@@ -2,6 +2,16 @@ import os
 import json
 from typing import List, Dict
 
+ATTACHMENT_DIR = "attachment"
+PROVIDER_FILES = [
+    "desh travel.txt",
+    "ena.txt",
+    "green line.txt",
+    "hanif.txt",
+    "shyamoli.txt",
+    "soudia.txt"
+]
+
 class RAGPipeline:
     """Simple keyword-based search for bus provider information (No ML required)"""
     def __init__(self):
@@ -10,18 +20,8 @@ class RAGPipeline:
     
     def load_documents(self):
         """Load bus provider documents from attachment folder"""
-        attachment_dir = "attachment"
-        provider_files = [
-            "desh travel.txt",
-            "ena.txt",
-            "green line.txt",
-            "hanif.txt",
-            "shyamoli.txt",
-            "soudia.txt"
-        ]
-        
-        for filename in provider_files:
-            filepath = os.path.join(attachment_dir, filename)
+        for filename in PROVIDER_FILES:
+            filepath = os.path.join(ATTACHMENT_DIR, filename)
             if os.path.exists(filepath):
                 with open(filepath, 'r', encoding='utf-8') as f:
                     content = f.read()
@@ -29,6 +29,7 @@ class RAGPipeline:
                     self.documents.append({
                         'provider': provider_name,
                         'content': content,
+                        'search_text': content.lower(),  # lowercased once, searched by every query
                         'filename': filename
                     })
     
@@ -42,7 +43,7 @@ class RAGPipeline:
         
         for doc in self.documents:
             # Count keyword matches
-            content_lower = doc['content'].lower()
+            content_lower = doc['search_text']
             score = sum(1 for word in query_lower.split() if word in content_lower)
             
             if score > 0: